@@ -6,6 +6,7 @@ Import and use these functions in your API endpoints for database operations.
 """
 
 from pymongo import MongoClient
+from motor.motor_asyncio import AsyncIOMotorClient
 from datetime import datetime, timezone
 import os
 from dotenv import load_dotenv
@@ -16,7 +17,9 @@ from pydantic import BaseModel
 load_dotenv()
 
 _client = None
+_motor_client = None
 db = None
+motor_db = None
 
 database_url = os.getenv("DATABASE_URL")
 database_name = os.getenv("DATABASE_NAME")
@@ -24,6 +27,10 @@ database_name = os.getenv("DATABASE_NAME")
 if database_url and database_name:
     _client = MongoClient(database_url)
     db = _client[database_name]
+    # Async handle to the same database for non-blocking writes from the
+    # event loop (background writer in main.py).
+    _motor_client = AsyncIOMotorClient(database_url)
+    motor_db = _motor_client[database_name]
 
 # Helper functions for common database operations
 def create_document(collection_name: str, data: Union[BaseModel, dict]):
@@ -47,9 +54,20 @@ def get_documents(collection_name: str, filter_dict: dict = None, limit: int = N
     """Get documents from collection"""
     if db is None:
         raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
-    
+
     cursor = db[collection_name].find(filter_dict or {})
     if limit:
         cursor = cursor.limit(limit)
-    
+
     return list(cursor)
+
+async def aggregate_documents(collection_name: str, pipeline: list):
+    """Run an aggregation pipeline and return the result list
+
+    Uses the async driver so awaiting callers don't block the event loop
+    on the Mongo round-trip.
+    """
+    if motor_db is None:
+        raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
+
+    return await motor_db[collection_name].aggregate(pipeline).to_list(None)
@@ -1,17 +1,220 @@
+import asyncio
+import logging
 import os
-import json
 import random
 from datetime import datetime, timezone
 from typing import List, Optional
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Query
+import orjson
+from fastapi import BackgroundTasks, FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
-import requests
+import httpx
+import redis.asyncio as aioredis
+from bson import ObjectId
 
-from database import db, create_document, get_documents
+from database import db, motor_db, aggregate_documents, create_document
 
-app = FastAPI(title="VoidSpark.world API", version="0.3.0")
+logger = logging.getLogger("uvicorn.error")
+
+
+class BSONORJSONResponse(ORJSONResponse):
+    """ORJSONResponse that stringifies BSON types (ObjectId, etc.)."""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, default=str)
+
+
+app = FastAPI(title="VoidSpark.world API", version="0.3.0", default_response_class=BSONORJSONResponse)
+
+
+@app.on_event("startup")
+async def startup_http_client():
+    # Shared client: keeps a connection pool (and one HTTP/2 session) to the
+    # RPC alive instead of opening a fresh socket per request.
+    app.state.http = httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        timeout=8.0,
+    )
+
+
+@app.on_event("startup")
+async def startup_redis():
+    # Optional like the Mongo connection: without REDIS_URL the app runs
+    # uncached and every request falls through to RPC/Mongo.
+    redis_url = os.getenv("REDIS_URL")
+    app.state.redis = aioredis.from_url(redis_url) if redis_url else None
+
+
+# Coarse clock for non-audit timestamps (chat frames, generated quest
+# expiry). datetime.now(timezone.utc) plus isoformat() is measurable on the
+# broadcast hot path, so a background task refreshes these every 100ms and
+# hot paths just read the latest value. Audit-relevant writes (logins,
+# trades, enqueue_write stamps) keep calling datetime.now directly.
+_NOW = [datetime.now(timezone.utc)]
+_NOW_ISO = [_NOW[0].isoformat()]
+_NOW_TS = [_NOW[0].timestamp()]
+
+
+async def clock_loop():
+    while True:
+        now = datetime.now(timezone.utc)
+        _NOW[0] = now
+        _NOW_ISO[0] = now.isoformat()
+        _NOW_TS[0] = now.timestamp()
+        await asyncio.sleep(0.1)
+
+
+@app.on_event("startup")
+async def startup_clock():
+    app.state.clock_task = asyncio.create_task(clock_loop())
+
+
+@app.on_event("shutdown")
+async def shutdown_clock():
+    app.state.clock_task.cancel()
+
+
+@app.on_event("startup")
+async def startup_indexes():
+    # Indexes for the hot query paths, so inventory/listings reads stay
+    # IXSCANs instead of collection scans as the data grows. create_index
+    # is a no-op when the index already exists.
+    if db is None:
+        return
+    db.item.create_index("owner")
+    db.listing.create_index([("status", 1), ("created_at", -1)])
+    db.token_trades.create_index([("wallet", 1), ("time", -1)])
+    try:
+        db.player.create_index("address", unique=True)
+    except Exception:
+        # Databases populated before logins became upserts may hold
+        # duplicate addresses; run without the unique constraint rather
+        # than failing the boot.
+        logger.exception("could not build unique player.address index")
+
+
+@app.on_event("startup")
+async def startup_writer():
+    # Mutating endpoints enqueue their Mongo inserts here; a single worker
+    # task drains the queue in batches via the async driver so handlers
+    # return without waiting on a database round-trip.
+    if motor_db is not None:
+        app.state.write_q = asyncio.Queue()
+        app.state.writer_task = asyncio.create_task(writer_loop(app.state.write_q))
+    else:
+        app.state.write_q = None
+        app.state.writer_task = None
+
+
+@app.on_event("shutdown")
+async def shutdown_http_client():
+    await app.state.http.aclose()
+
+
+@app.on_event("shutdown")
+async def shutdown_writer():
+    if app.state.writer_task is not None:
+        # Flush whatever is still queued before tearing the loop down.
+        await app.state.write_q.join()
+        app.state.writer_task.cancel()
+
+
+async def _flush_write(op_desc: str, coro_factory):
+    # A failed flush must not kill the worker, but it also must not vanish
+    # silently: retry once, then log what was dropped.
+    for attempt in (1, 2):
+        try:
+            await coro_factory()
+            return
+        except Exception:
+            if attempt == 1:
+                logger.exception("writer_loop: %s failed, retrying once", op_desc)
+            else:
+                logger.exception("writer_loop: giving up on %s after retry", op_desc)
+
+
+async def writer_loop(q: asyncio.Queue):
+    while True:
+        batch = [await q.get()]
+        while not q.empty() and len(batch) < 500:
+            batch.append(q.get_nowait())
+        inserts = {}
+        updates = []
+        for op, collection_name, payload in batch:
+            if op == "insert":
+                inserts.setdefault(collection_name, []).append(payload)
+            else:
+                updates.append((collection_name, payload))
+        for collection_name, docs in inserts.items():
+            await _flush_write(
+                f"insert_many of {len(docs)} document(s) into {collection_name!r}",
+                lambda c=collection_name, d=docs: motor_db[c].insert_many(d, ordered=False),
+            )
+        # Updates run after the batch's inserts so an update_one enqueued
+        # right behind its target's insert can't race ahead of it.
+        for collection_name, (filter_dict, update, upsert) in updates:
+            await _flush_write(
+                f"update_one on {collection_name!r}",
+                lambda c=collection_name, f=filter_dict, u=update, up=upsert:
+                    motor_db[c].update_one(f, u, upsert=up),
+            )
+        for _ in batch:
+            q.task_done()
+
+
+async def enqueue_write(collection_name: str, doc: dict):
+    """Queue a Mongo insert so the response doesn't wait on the write."""
+    doc["created_at"] = datetime.now(timezone.utc)
+    doc["updated_at"] = datetime.now(timezone.utc)
+    if app.state.write_q is not None:
+        await app.state.write_q.put(("insert", collection_name, doc))
+    else:
+        # No async writer without a configured database; fall back to the
+        # sync helper so callers see the same error as before.
+        create_document(collection_name, doc)
+
+
+async def enqueue_update(collection_name: str, filter_dict: dict, update: dict, upsert: bool = False):
+    """Queue a Mongo update_one so the response doesn't wait on the write."""
+    update.setdefault("$set", {})["updated_at"] = datetime.now(timezone.utc)
+    if app.state.write_q is not None:
+        await app.state.write_q.put(("update", collection_name, (filter_dict, update, upsert)))
+    else:
+        if db is None:
+            raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
+        db[collection_name].update_one(filter_dict, update, upsert=upsert)
+
+
+# Cache helpers: no-ops when Redis is not configured or unreachable, so the
+# endpoints below never fail because of the cache layer.
+async def cache_get(key: str):
+    if app.state.redis is None:
+        return None
+    try:
+        return await app.state.redis.get(key)
+    except aioredis.RedisError:
+        return None
+
+
+async def cache_set(key: str, value, ttl: int):
+    if app.state.redis is None:
+        return
+    try:
+        await app.state.redis.set(key, value, ex=ttl)
+    except aioredis.RedisError:
+        pass
+
+
+async def cache_delete(*keys: str):
+    if app.state.redis is None:
+        return
+    try:
+        await app.state.redis.delete(*keys)
+    except aioredis.RedisError:
+        pass
 
 app.add_middleware(
     CORSMiddleware,
@@ -58,37 +261,47 @@ class QuestClaimRequest(BaseModel):
     quest_code: str
     enemies_defeated: int
 
+class BalancesRequest(BaseModel):
+    addresses: List[str]
+
 
 # -----------------------------
 # Utility: simple AI generators
 # -----------------------------
+# Static choice pools, hoisted to module-level tuples so hot generator
+# calls don't rebuild them per request.
+_TARGETS = ("Sentinel", "Wraith", "Marauder", "Crawler", "Revenant")
+_QUEST_ZONES = ("Obsidian Flats", "Neon Mire", "Fracture Ridge", "Echo Dunes")
+_REWARD_ITEMS = ("Ion Blade", "Aether Core", "Flux Capacitor")
+_WEATHER = ("ion-storm", "clear", "acid-rain", "solar-flare", "dust")
+_RESOURCE_TYPES = ("ferrocrete", "aether", "plasma")
+
+
 def generate_quest(seed: Optional[int] = None) -> dict:
     rnd = random.Random(seed or random.randint(1, 10_000_000))
-    targets = ["Sentinel", "Wraith", "Marauder", "Crawler", "Revenant"]
-    zones = ["Obsidian Flats", "Neon Mire", "Fracture Ridge", "Echo Dunes"]
-    rewards = [
-        {"type": "token", "amount": rnd.randint(5, 25)},
-        {"type": "item", "name": rnd.choice(["Ion Blade", "Aether Core", "Flux Capacitor"])},
-    ]
+    # Build only the reward variant that gets picked.
+    if rnd.random() < 0.5:
+        reward = {"type": "token", "amount": rnd.randint(5, 25)}
+    else:
+        reward = {"type": "item", "name": rnd.choice(_REWARD_ITEMS)}
     quest = {
-        "title": f"Cull the {rnd.choice(targets)}",
-        "zone": rnd.choice(zones),
+        "title": f"Cull the {rnd.choice(_TARGETS)}",
+        "zone": rnd.choice(_QUEST_ZONES),
         "objective": "Eliminate hostiles and recover components",
         "target_count": rnd.randint(3, 12),
-        "reward": rnd.choice(rewards),
-        "expires_at": datetime.now(timezone.utc).isoformat(),
+        "reward": reward,
+        "expires_at": _NOW_ISO[0],
     }
     return quest
 
 
 def generate_zone(seed: Optional[int] = None) -> dict:
     rnd = random.Random(seed or random.randint(1, 10_000_000))
-    weather = rnd.choice(["ion-storm", "clear", "acid-rain", "solar-flare", "dust"])
+    weather = rnd.choice(_WEATHER)
     density = rnd.uniform(0.1, 1.0)
     resources = [
-        {"type": "ferrocrete", "richness": round(rnd.uniform(0, 1), 2)},
-        {"type": "aether", "richness": round(rnd.uniform(0, 1), 2)},
-        {"type": "plasma", "richness": round(rnd.uniform(0, 1), 2)},
+        {"type": t, "richness": round(rnd.uniform(0, 1), 2)}
+        for t in _RESOURCE_TYPES
     ]
     return {
         "name": f"Zone-{rnd.randint(100,999)}",
@@ -137,84 +350,139 @@ def test_database():
 
 # Wallet auth (challenge-less demo: link address)
 @app.post("/api/player/login-wallet")
-def login_wallet(payload: WalletLoginRequest):
+async def login_wallet(payload: WalletLoginRequest, background_tasks: BackgroundTasks):
     if not payload.address or len(payload.address) < 20:
         raise HTTPException(status_code=400, detail="Invalid wallet address")
-    player_doc = {
-        "address": payload.address,
-        "last_login": datetime.now(timezone.utc),
-        "stats": {"level": 1, "xp": 0, "hp": 100},
-    }
-    create_document("player", player_doc)
+    now = datetime.now(timezone.utc)
+    # Upsert one doc per address: repeat logins refresh last_login without
+    # piling up duplicates (which would also break the unique index).
+    background_tasks.add_task(
+        enqueue_update,
+        "player",
+        {"address": payload.address},
+        {
+            "$set": {"last_login": now},
+            "$setOnInsert": {"stats": {"level": 1, "xp": 0, "hp": 100}, "created_at": now},
+        },
+        True,
+    )
     return {"ok": True, "player": {"address": payload.address}}
 
 
 # AI endpoints
 @app.get("/api/ai/quest")
-def ai_quest(seed: Optional[int] = None):
+async def ai_quest(background_tasks: BackgroundTasks, seed: Optional[int] = None):
     quest = generate_quest(seed)
-    create_document("quest", {**quest, "seed": seed or None})
+    background_tasks.add_task(enqueue_write, "quest", {**quest, "seed": seed or None})
     return quest
 
 
 @app.get("/api/ai/zone")
-def ai_zone(seed: Optional[int] = None):
+async def ai_zone(background_tasks: BackgroundTasks, seed: Optional[int] = None):
     zone = generate_zone(seed)
-    create_document("zone", {**zone, "seed": seed or None})
+    background_tasks.add_task(enqueue_write, "zone", {**zone, "seed": seed or None})
     return zone
 
 
 # Items & inventory
 @app.post("/api/item/create")
-def create_item(item: ItemCreate):
+async def create_item(item: ItemCreate):
     doc = item.model_dump()
-    doc["created_at"] = datetime.now(timezone.utc)
-    doc["updated_at"] = datetime.now(timezone.utc)
-    _id = create_document("item", doc)
-    return {"ok": True, "id": _id}
+    # Pre-generate the id client-side so the response doesn't wait on the
+    # insert to learn it.
+    doc["_id"] = ObjectId()
+    await enqueue_write("item", doc)
+    await cache_delete(f"inv:{item.owner}")
+    return {"ok": True, "id": str(doc["_id"])}
 
 
 @app.get("/api/inventory/{wallet}")
-def get_inventory(wallet: str):
-    items = get_documents("item", {"owner": wallet})
-    # convert ObjectIds to strings if needed
-    def normalize(doc):
-        d = dict(doc)
-        if "_id" in d:
-            d["_id"] = str(d["_id"])
-        return d
-    return {"items": [normalize(i) for i in items]}
+async def get_inventory(wallet: str):
+    # Cache the fully-serialized JSON so a hit skips both the Mongo query
+    # and FastAPI's response re-serialization.
+    cached = await cache_get(f"inv:{wallet}")
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+    # $toString converts _id during BSON decoding on the server, so the
+    # documents arrive ready to serialize with no per-doc post-processing.
+    items = await aggregate_documents("item", [
+        {"$match": {"owner": wallet}},
+        {"$set": {"_id": {"$toString": "$_id"}}},
+    ])
+    payload = orjson.dumps({"items": items}, default=str)
+    await cache_set(f"inv:{wallet}", payload, ttl=60)
+    return Response(content=payload, media_type="application/json")
 
 
 # Marketplace
 @app.get("/api/marketplace/listings")
-def listings():
-    docs = get_documents("listing", {})
-    def n(d):
-        d = dict(d)
-        d["_id"] = str(d.get("_id"))
-        return d
-    return {"listings": [n(x) for x in docs]}
+async def listings():
+    cached = await cache_get("mkt:listings")
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+    docs = await aggregate_documents("listing", [
+        {"$match": {"status": "open"}},
+        {"$sort": {"created_at": -1}},
+        {"$limit": 200},
+        {"$set": {"_id": {"$toString": "$_id"}}},
+    ])
+    payload = orjson.dumps({"listings": docs}, default=str)
+    await cache_set("mkt:listings", payload, ttl=30)
+    return Response(content=payload, media_type="application/json")
 
 
 @app.post("/api/marketplace/create")
-def create_listing(payload: CreateListingRequest):
+async def create_listing(payload: CreateListingRequest):
     listing = payload.model_dump()
-    listing["created_at"] = datetime.now(timezone.utc)
+    listing["_id"] = ObjectId()
     listing["status"] = "open"
-    _id = create_document("listing", listing)
-    return {"ok": True, "id": _id}
+    await enqueue_write("listing", listing)
+    # Mirror the open listing into Redis so buys can claim it atomically.
+    if app.state.redis is not None:
+        try:
+            await app.state.redis.set(
+                f"listing:{listing['_id']}",
+                orjson.dumps(listing, default=str),
+                nx=True,
+                ex=86400,
+            )
+        except aioredis.RedisError:
+            pass
+    await cache_delete("mkt:listings")
+    return {"ok": True, "id": str(listing["_id"])}
 
 
 @app.post("/api/marketplace/buy")
-def buy_listing(payload: TradeActionRequest):
+async def buy_listing(payload: TradeActionRequest):
+    # GETDEL claims the listing in one atomic O(1) op: exactly one of any
+    # number of concurrent buyers gets a non-None result, everyone else
+    # sees it already sold. Without Redis we fall back to just logging the
+    # trade, as before.
+    if app.state.redis is not None:
+        try:
+            claimed = await app.state.redis.getdel(f"listing:{payload.listing_id}")
+        except aioredis.RedisError:
+            claimed = b""
+        if claimed is None:
+            raise HTTPException(status_code=409, detail="Listing already sold")
     doc = {
         "action": "buy",
         "wallet": payload.wallet,
         "listing_id": payload.listing_id,
         "time": datetime.now(timezone.utc),
     }
-    create_document("trade", doc)
+    await enqueue_write("trade", doc)
+    # Mark the listing sold through the writer queue; it drains in FIFO
+    # order with inserts flushed first, so this can't overtake a listing
+    # insert still sitting in the queue. The claim above is what guards
+    # against double-buys.
+    if ObjectId.is_valid(payload.listing_id):
+        await enqueue_update(
+            "listing",
+            {"_id": ObjectId(payload.listing_id)},
+            {"$set": {"status": "sold"}},
+        )
+    await cache_delete("mkt:listings")
     return {"ok": True}
 
 
@@ -222,41 +490,96 @@ def buy_listing(payload: TradeActionRequest):
 SOLANA_RPC = os.getenv("SOLANA_RPC", "https://api.mainnet-beta.solana.com")
 
 @app.get("/getBalance")
-def get_balance(address: str = Query(..., description="Solana wallet address")):
+async def get_balance(address: str = Query(..., description="Solana wallet address")):
     try:
+        cached = await cache_get(f"bal:{address}")
+        if cached is not None:
+            lamports = int(cached)
+            return {"address": address, "lamports": lamports, "sol": lamports / 1e9, "cached": True}
         payload = {
             "jsonrpc": "2.0",
             "id": 1,
             "method": "getBalance",
             "params": [address],
         }
-        r = requests.post(SOLANA_RPC, json=payload, timeout=8)
-        lamports = r.json().get("result", {}).get("value", 0) if r.ok else 0
+        r = await app.state.http.post(SOLANA_RPC, json=payload)
+        if r.status_code == 200:
+            lamports = r.json().get("result", {}).get("value", 0)
+            # Only cache real RPC answers; a 429/5xx fallback of 0 must not
+            # be served as a legitimate balance for the next 5 seconds.
+            await cache_set(f"bal:{address}", lamports, ttl=5)
+        else:
+            lamports = 0
         return {"address": address, "lamports": lamports, "sol": lamports / 1e9}
-    except Exception as e:
+    except httpx.HTTPError as e:
         return {"address": address, "lamports": 0, "sol": 0, "error": str(e)[:120]}
 
 
+# Some providers count each batch element against rate limits and one slow
+# element stalls the whole batch, so above this size we fan out instead.
+BATCH_RPC_LIMIT = 50
+
+async def _fetch_balance_lamports(address: str) -> int:
+    try:
+        payload = {"jsonrpc": "2.0", "id": 1, "method": "getBalance", "params": [address]}
+        r = await app.state.http.post(SOLANA_RPC, json=payload)
+        return r.json().get("result", {}).get("value", 0) if r.status_code == 200 else 0
+    except httpx.HTTPError:
+        return 0
+
+
+@app.post("/getBalances")
+async def get_balances(req: BalancesRequest):
+    addresses = req.addresses
+    if not addresses:
+        return {"balances": []}
+    try:
+        if len(addresses) <= BATCH_RPC_LIMIT:
+            # One JSON-RPC v2 batch: N balances in a single round-trip. The
+            # spec allows out-of-order responses, so re-sort by id.
+            batch = [
+                {"jsonrpc": "2.0", "id": i, "method": "getBalance", "params": [a]}
+                for i, a in enumerate(addresses)
+            ]
+            r = await app.state.http.post(SOLANA_RPC, json=batch)
+            lamports = [0] * len(addresses)
+            if r.status_code == 200:
+                for entry in r.json():
+                    i = entry.get("id")
+                    if isinstance(i, int) and 0 <= i < len(addresses):
+                        lamports[i] = entry.get("result", {}).get("value", 0)
+        else:
+            lamports = await asyncio.gather(*[_fetch_balance_lamports(a) for a in addresses])
+        return {
+            "balances": [
+                {"address": a, "lamports": v, "sol": v / 1e9}
+                for a, v in zip(addresses, lamports)
+            ]
+        }
+    except httpx.HTTPError as e:
+        return {"balances": [], "error": str(e)[:120]}
+
+
 @app.post("/buyItem")
-def buy_item(req: BuySellRequest):
+async def buy_item(req: BuySellRequest, background_tasks: BackgroundTasks):
     doc = req.model_dump()
     doc["action"] = "buy"
     doc["time"] = datetime.now(timezone.utc)
-    create_document("token_trades", doc)
+    background_tasks.add_task(enqueue_write, "token_trades", doc)
     return {"ok": True}
 
 
 @app.post("/sellItem")
-def sell_item(req: BuySellRequest):
+async def sell_item(req: BuySellRequest, background_tasks: BackgroundTasks):
     doc = req.model_dump()
     doc["action"] = "sell"
     doc["time"] = datetime.now(timezone.utc)
-    create_document("token_trades", doc)
+    background_tasks.add_task(enqueue_write, "token_trades", doc)
     return {"ok": True}
 
 
 @app.post("/mintItemNFT")
-def mint_item_nft(req: MintItemRequest):
+async def mint_item_nft(req: MintItemRequest, background_tasks: BackgroundTasks):
     # Placeholder: In production, this should be done client-side with wallet signature
     # and an Anchor program. Here we just log intent for automation pipeline.
     record = {
@@ -266,35 +589,37 @@ def mint_item_nft(req: MintItemRequest):
         "intent": "mint_nft",
         "time": datetime.now(timezone.utc),
     }
-    create_document("nft_mint_intents", record)
+    background_tasks.add_task(enqueue_write, "nft_mint_intents", record)
     return {"ok": True, "note": "Recorded mint intent. Use deployment scripts to mint on-chain."}
 
 
 # Quest reward claim (demo): award an item when enemies_defeated >= 5
 @app.post("/api/quest/claim")
-def quest_claim(req: QuestClaimRequest):
+async def quest_claim(req: QuestClaimRequest):
     if not req.wallet or len(req.wallet) < 20:
         raise HTTPException(status_code=400, detail="Invalid wallet")
     if req.enemies_defeated < 5:
         raise HTTPException(status_code=400, detail="Quest not complete")
     reward_item = {
+        "_id": ObjectId(),
         "owner": req.wallet,
         "name": "Void Relic",
         "rarity": "uncommon",
         "stats": {"power": 5, "origin": "demo"},
         "quest_code": req.quest_code,
-        "created_at": datetime.now(timezone.utc),
-        "updated_at": datetime.now(timezone.utc),
     }
-    item_id = create_document("item", reward_item)
+    await enqueue_write("item", reward_item)
     # also log quest completion
-    create_document("quest_completion", {
+    await enqueue_write("quest_completion", {
         "wallet": req.wallet,
         "quest_code": req.quest_code,
         "enemies_defeated": req.enemies_defeated,
         "time": datetime.now(timezone.utc),
     })
-    return {"ok": True, "item_id": item_id}
+    # The reward touches the item collection, so the wallet's cached
+    # inventory is stale until this key is dropped.
+    await cache_delete(f"inv:{req.wallet}")
+    return {"ok": True, "item_id": str(reward_item["_id"])}
 
 
 # -----------------------------
@@ -328,29 +653,86 @@ def onchain_config():
 
 
 # WebSocket: simple pub-sub for world events
+WS_CHANNEL = "ws"
+
+
 class ConnectionManager:
     def __init__(self):
-        self.active: List[WebSocket] = []
+        self.active: set[WebSocket] = set()
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active.append(websocket)
+        self.active.add(websocket)
 
     def disconnect(self, websocket: WebSocket):
-        if websocket in self.active:
-            self.active.remove(websocket)
+        self.active.discard(websocket)
 
     async def broadcast(self, message: dict):
-        data = json.dumps(message)
-        for connection in list(self.active):
+        # orjson returns bytes, and send_bytes skips the str->UTF-8 encode
+        # that send_text would redo per connection.
+        await self.broadcast_raw(orjson.dumps(message))
+
+    async def broadcast_raw(self, data: bytes):
+        # With multiple workers each process only sees its own sockets, so
+        # route broadcasts through Redis pub/sub when it's available; every
+        # worker's relay loop then delivers to its local connections.
+        if app.state.redis is not None:
             try:
-                await connection.send_text(data)
-            except Exception:
+                await app.state.redis.publish(WS_CHANNEL, data)
+                return
+            except aioredis.RedisError:
+                pass
+        await self.fanout_local(data)
+
+    async def fanout_local(self, data: bytes):
+        # Fan out concurrently: one slow client no longer delays delivery
+        # to everyone behind it in the loop.
+        connections = list(self.active)
+        results = await asyncio.gather(
+            *[connection.send_bytes(data) for connection in connections],
+            return_exceptions=True,
+        )
+        for connection, result in zip(connections, results):
+            if isinstance(result, Exception):
                 self.disconnect(connection)
 
 manager = ConnectionManager()
 
 
+async def ws_relay_loop():
+    pubsub = app.state.redis.pubsub()
+    await pubsub.subscribe(WS_CHANNEL)
+    try:
+        async for message in pubsub.listen():
+            if message["type"] == "message":
+                await manager.fanout_local(message["data"])
+    finally:
+        await pubsub.aclose()
+
+
+@app.on_event("startup")
+async def startup_ws_relay():
+    if app.state.redis is not None:
+        app.state.ws_relay_task = asyncio.create_task(ws_relay_loop())
+    else:
+        app.state.ws_relay_task = None
+
+
+@app.on_event("shutdown")
+async def shutdown_ws_relay():
+    # Registered last so it runs after the other shutdown hooks: stop the
+    # relay while the Redis client it listens on is still open, then close
+    # the client itself.
+    if app.state.ws_relay_task is not None:
+        app.state.ws_relay_task.cancel()
+        try:
+            await app.state.ws_relay_task
+        except asyncio.CancelledError:
+            pass
+    if app.state.redis is not None:
+        await app.state.redis.aclose()
+
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     await manager.connect(websocket)
@@ -358,7 +740,17 @@ async def websocket_endpoint(websocket: WebSocket):
     try:
         while True:
             text = await websocket.receive_text()
-            await manager.broadcast({"type": "chat", "text": text, "ts": datetime.now(timezone.utc).isoformat()})
+            # Splice the chat frame together from bytes: the only JSON work
+            # per message is escaping the text itself, not building and
+            # serializing an envelope dict.
+            frame = (
+                b'{"type":"chat","ts":'
+                + repr(_NOW_TS[0]).encode()
+                + b',"text":'
+                + orjson.dumps(text)
+                + b"}"
+            )
+            await manager.broadcast_raw(frame)
     except WebSocketDisconnect:
         manager.disconnect(websocket)
         await manager.broadcast({"type": "system", "message": "Player left"})
@@ -367,4 +759,11 @@ async def websocket_endpoint(websocket: WebSocket):
 if __name__ == "__main__":
     import uvicorn
     port = int(os.getenv("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=port,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 2)),
+    )